@@ -1,33 +1,87 @@
 ﻿"""
 Main configuration file for the UK Energy Grid Dashboard.
+
+Paths and environment-derived settings are resolved lazily on first access,
+so importing this module does no filesystem or .env I/O. Module-level names
+such as RAW_DATA_DIR and DATABASE_URL remain importable for backward
+compatibility via __getattr__.
 """
 import os
+from functools import cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+
+@cache
+def _env_loaded() -> bool:
+    """Load environment variables from .env once, on first use."""
+    load_dotenv()
+    return True
+
+
+def _getenv(key: str, default: str) -> str:
+    _env_loaded()
+    return os.getenv(key, default)
+
 
 # Project paths
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
-RAW_DATA_DIR = DATA_DIR / "raw"
-PROCESSED_DATA_DIR = DATA_DIR / "processed"
-PREDICTIONS_DIR = DATA_DIR / "predictions"
-LOGS_DIR = BASE_DIR / "logs"
+@cache
+def base_dir() -> Path:
+    return Path(__file__).parent.parent
+
+
+@cache
+def data_dir() -> Path:
+    return base_dir() / "data"
+
+
+@cache
+def raw_data_dir() -> Path:
+    return data_dir() / "raw"
+
+
+@cache
+def processed_data_dir() -> Path:
+    return data_dir() / "processed"
+
+
+@cache
+def predictions_dir() -> Path:
+    return data_dir() / "predictions"
+
+
+@cache
+def logs_dir() -> Path:
+    return base_dir() / "logs"
+
+
+@cache
+def http_cache_path() -> Path:
+    # API response cache: requests-cache adds ".sqlite"; the async backfill uses the directory
+    return data_dir() / "http_cache"
+
 
 # API Configuration
 GRID_ESO_BASE_URL = "https://api.bmreports.com/BMRS"
-GRID_ESO_API_KEY = os.getenv("GRID_ESO_API_KEY", "")  # Optional, check if needed
+
+
+@cache
+def grid_eso_api_key() -> str:
+    return _getenv("GRID_ESO_API_KEY", "")  # Optional, check if needed
+
 
 # Database Configuration
-DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    f"sqlite:///{DATA_DIR / 'energy_grid.db'}"
-)
+@cache
+def database_url() -> str:
+    return _getenv(
+        "DATABASE_URL",
+        f"sqlite:///{data_dir() / 'energy_grid.db'}"
+    )
+
 
 # Data Collection Settings
 DATA_REFRESH_INTERVAL = 1800  # 30 minutes in seconds
+HTTP_CACHE_TTL_HOURS = 24  # Elexon data is treated as final after a day
 HISTORICAL_DAYS = 365  # Days of historical data to fetch initially
 FUEL_TYPES = [
     "coal", "gas", "nuclear", "wind", "solar", 
@@ -43,11 +97,56 @@ ANOMALY_THRESHOLD = 2.5  # standard deviations
 DASHBOARD_UPDATE_INTERVAL = 30  # seconds
 DASHBOARD_PORT = 8501
 
+
 # Logging Configuration
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+@cache
+def log_level() -> str:
+    return _getenv("LOG_LEVEL", "INFO")
+
+
 LOG_FORMAT = "json"  # json or text
 
+
 # Monitoring (Part 2)
-ENABLE_MLFLOW = os.getenv("ENABLE_MLFLOW", "False").lower() == "true"
-MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "")
-ENABLE_PROMETHEUS = os.getenv("ENABLE_PROMETHEUS", "False").lower() == "true"
+@cache
+def enable_mlflow() -> bool:
+    return _getenv("ENABLE_MLFLOW", "False").lower() == "true"
+
+
+@cache
+def mlflow_tracking_uri() -> str:
+    return _getenv("MLFLOW_TRACKING_URI", "")
+
+
+@cache
+def enable_prometheus() -> bool:
+    return _getenv("ENABLE_PROMETHEUS", "False").lower() == "true"
+
+
+# Backward-compatible constant names -> lazy getters
+_LAZY_SETTINGS = {
+    "BASE_DIR": base_dir,
+    "DATA_DIR": data_dir,
+    "RAW_DATA_DIR": raw_data_dir,
+    "PROCESSED_DATA_DIR": processed_data_dir,
+    "PREDICTIONS_DIR": predictions_dir,
+    "LOGS_DIR": logs_dir,
+    "HTTP_CACHE_PATH": http_cache_path,
+    "GRID_ESO_API_KEY": grid_eso_api_key,
+    "DATABASE_URL": database_url,
+    "LOG_LEVEL": log_level,
+    "ENABLE_MLFLOW": enable_mlflow,
+    "MLFLOW_TRACKING_URI": mlflow_tracking_uri,
+    "ENABLE_PROMETHEUS": enable_prometheus,
+}
+
+
+def __getattr__(name: str):
+    try:
+        return _LAZY_SETTINGS[name]()
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_SETTINGS))
@@ -1,10 +1,15 @@
 ﻿"""
 Initialize database schema for UK Energy Grid Dashboard.
 """
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean, JSON
+from sqlalchemy import create_engine, event, Index, Column, Integer, Float, String, DateTime, Boolean, JSON
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
+import pandas as pd
 import sys
+from functools import cache
+from typing import Optional
 from pathlib import Path
 
 # Add parent directory to path
@@ -16,6 +21,9 @@ Base = declarative_base()
 
 class GenerationData(Base):
     __tablename__ = 'generation_data'
+    __table_args__ = (
+        Index('ix_gen_ts_fuel', 'timestamp', 'fuel_type'),
+    )
     
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime(timezone=True), nullable=False)
@@ -26,6 +34,9 @@ class GenerationData(Base):
 
 class Prediction(Base):
     __tablename__ = 'predictions'
+    __table_args__ = (
+        Index('ix_pred_target_fuel', 'target_timestamp', 'fuel_type'),
+    )
     
     id = Column(Integer, primary_key=True)
     model_name = Column(String(100), nullable=False)
@@ -38,6 +49,9 @@ class Prediction(Base):
 
 class ModelMetrics(Base):
     __tablename__ = 'model_metrics'
+    __table_args__ = (
+        Index('ix_metrics_model_eval', 'model_name', 'evaluation_timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     model_name = Column(String(100), nullable=False)
@@ -57,11 +71,65 @@ class DataQuality(Base):
     timestamp = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL journaling and a larger page cache on each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.close()
+
+@cache
+def get_engine() -> Engine:
+    """
+    Return the shared, pooled engine for DATABASE_URL.
+    
+    SQLite connections are pooled with QueuePool (rather than the default
+    per-thread pool) so readers can run alongside ingestion under WAL.
+    """
+    if make_url(DATABASE_URL).get_backend_name() == "sqlite":
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=QueuePool,
+            pool_size=5,
+            pool_pre_ping=True,
+            connect_args={"check_same_thread": False, "timeout": 30}
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    else:
+        engine = create_engine(DATABASE_URL, pool_size=5, pool_pre_ping=True)
+    return engine
+
 def init_database():
     """Create all database tables."""
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine()
     Base.metadata.create_all(engine)
     print(f"✅ Database initialized successfully at {DATABASE_URL}")
 
+def bulk_insert_generation(df: pd.DataFrame, engine: Optional[Engine] = None) -> int:
+    """
+    Insert generation records in a single transaction using batched multi-row INSERTs.
+    
+    Columns not present in the generation_data table (e.g. total_generation
+    from the fetcher's quality checks) are dropped. Uses get_engine() unless
+    an engine is given.
+    
+    Returns:
+        Number of rows inserted
+    """
+    engine = engine or get_engine()
+    columns = [c for c in df.columns if c in GenerationData.__table__.columns and c != "id"]
+    with engine.begin() as conn:
+        df[columns].to_sql(
+            GenerationData.__tablename__,
+            conn,
+            if_exists="append",
+            index=False,
+            method="multi",
+            chunksize=1000
+        )
+    return len(df)
+
 if __name__ == "__main__":
     init_database()
@@ -3,10 +3,22 @@
 Elexon API data fetcher for UK electricity generation data.
 Fetches actual generation by fuel type from the Elexon Portal API.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+import hishel
+import httpx
+import orjson
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession, DO_NOT_CACHE
+from urllib3.util.retry import Retry
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, List, Mapping, Tuple
+from types import MappingProxyType
 import time
 import logging
 from pathlib import Path
@@ -15,11 +27,144 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from config.config import RAW_DATA_DIR
+from config.config import RAW_DATA_DIR, HTTP_CACHE_PATH, HTTP_CACHE_TTL_HOURS, DATA_REFRESH_INTERVAL
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # we log our own request timings
+
+# GET responses are cached on disk so repeated backfills skip the network
+_CACHE_TTL = timedelta(hours=HTTP_CACHE_TTL_HOURS)
+
+# Single retry policy shared by the requests adapter and the async backfill
+_RETRY_ATTEMPTS = 3  # retries after the first attempt
+_RETRY_BACKOFF_FACTOR = 1  # seconds, doubled on each retry
+_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Retries happen inside the connection pool, with exponential backoff
+# and Retry-After support for rate-limited (429) and unavailable (503) responses
+_RETRY = Retry(
+    total=_RETRY_ATTEMPTS,
+    backoff_factor=_RETRY_BACKOFF_FACTOR,
+    status_forcelist=list(_RETRY_STATUS_CODES),
+    allowed_methods=['GET'],
+    respect_retry_after_header=True
+)
+
+# Adaptive rate limiting - only back off when the API signals it
+RATE_LIMIT_LOW_WATERMARK = 1  # requests remaining before we pause
+RATE_LIMIT_MAX_DELAY = 60  # seconds - cap on any single pause
+RATE_LIMIT_DEFAULT_DELAY = 1  # seconds - when quota is low but no reset time is given
+
+# Standardized fuel type names and categories (read-only, shared)
+_FUEL_TYPE_MAPPING = MappingProxyType({
+    'Biomass': 'renewable',
+    'Fossil Gas': 'fossil',
+    'Fossil Hard coal': 'fossil',
+    'Fossil Oil': 'fossil',
+    'Hydro Pumped Storage': 'renewable',
+    'Hydro Run-of-river and poundage': 'renewable',
+    'Nuclear': 'nuclear',
+    'Other': 'other',
+    'Solar': 'renewable',
+    'Wind Offshore': 'renewable',
+    'Wind Onshore': 'renewable'
+})
+
+
+def _iso(dt: datetime) -> str:
+    """
+    Format a datetime as the API's 'YYYY-MM-DDTHH:MM:SSZ' without strftime.
+    
+    Aware datetimes are converted to UTC; naive ones are assumed to be UTC.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return f'{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z'
+
+
+def _rate_limit_delay(headers: Mapping[str, str]) -> float:
+    """
+    Seconds to wait before the next request, based on rate-limit response headers.
+    
+    Honours Retry-After (seconds or HTTP date) and, when X-RateLimit-Remaining
+    is at or below RATE_LIMIT_LOW_WATERMARK, X-RateLimit-Reset (seconds or
+    epoch), falling back to RATE_LIMIT_DEFAULT_DELAY if no reset is given.
+    Returns 0 when the API has not asked us to slow down.
+    """
+    delay = 0.0
+    
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                pass
+    
+    remaining = headers.get('X-RateLimit-Remaining')
+    reset = headers.get('X-RateLimit-Reset')
+    if not delay and remaining is not None:
+        try:
+            if int(remaining) <= RATE_LIMIT_LOW_WATERMARK:
+                delay = RATE_LIMIT_DEFAULT_DELAY
+                if reset is not None:
+                    delay = float(reset)
+                    if delay > 1e9:  # epoch timestamp rather than seconds-until-reset
+                        delay -= time.time()
+        except ValueError:
+            pass
+    
+    return min(max(delay, 0.0), RATE_LIMIT_MAX_DELAY)
+
+
+def _as_requests_error(error: httpx.HTTPError) -> requests.RequestException:
+    """
+    Map an httpx error onto the requests exception the sync fetch path would raise.
+    
+    Keeps one exception contract (requests.RequestException) across the public API.
+    """
+    message = str(error)
+    if isinstance(error, httpx.HTTPStatusError):
+        return requests.HTTPError(message)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.Timeout(message)
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(message)
+    return requests.RequestException(message)
+
+
+@cache
+def get_session() -> requests.Session:
+    """
+    Returns the shared HTTP session used by all fetchers.
+    
+    Created on first use, so importing this module does no disk I/O. The
+    session pools connections across fetcher instances and caches GET
+    responses in HTTP_CACHE_PATH. Customise headers, adapters or auth on
+    this object to affect every request.
+    """
+    session = CachedSession(
+        str(HTTP_CACHE_PATH),
+        backend='sqlite',
+        expire_after=_CACHE_TTL,
+        allowable_methods=['GET']
+    )
+    session.headers.update({
+        'User-Agent': 'UK-Energy-Grid-Dashboard/1.0',
+        # JSON compresses well; br is decoded when the brotli package is installed
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Accept': 'application/json'
+    })
+    session.mount('https://', HTTPAdapter(
+        max_retries=_RETRY,
+        pool_connections=10,
+        pool_maxsize=20
+    ))
+    return session
 
 
 class ElexonDataFetcher:
@@ -35,61 +180,48 @@ class ElexonDataFetcher:
     # Data quality thresholds
     MIN_TOTAL_GENERATION = 25000  # MW - UK typically generates >25GW
     
+    # Historical fetch settings
+    CHUNK_SIZE_DAYS = 7  # days per request
+    MAX_CONCURRENT_REQUESTS = 5  # in-flight chunk requests
+    RETRY_ATTEMPTS = _RETRY_ATTEMPTS
+    RETRY_BACKOFF_FACTOR = _RETRY_BACKOFF_FACTOR
+    RETRY_STATUS_CODES = _RETRY_STATUS_CODES
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'UK-Energy-Grid-Dashboard/1.0'
-        })
+        self.session = get_session()
         
     def fetch_generation_data(
         self, 
         start_date: datetime, 
-        end_date: datetime,
-        retry_attempts: int = 3
+        end_date: datetime
     ) -> pd.DataFrame:
         """
         Fetch actual generation by fuel type for a date range.
         
+        Failed requests are retried by the session's HTTPAdapter.
+        
         Args:
             start_date: Start datetime for data fetch
             end_date: End datetime for data fetch
-            retry_attempts: Number of retry attempts on failure
             
         Returns:
             DataFrame with columns: timestamp, fuel_type, generation_mw
         """
         logger.info(f'Fetching generation data from {start_date} to {end_date}')
         
-        endpoint = f'{self.BASE_URL}/generation/actual/per-type'
+        endpoint, params = self._generation_request(start_date, end_date)
         
-        params = {
-            'from': start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'to': end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
+        # Only cache windows old enough that the API will no longer revise them
+        response = self._make_request(endpoint, params, cacheable=self._is_settled(end_date))
+        response.raise_for_status()
         
-        for attempt in range(retry_attempts):
-            try:
-                response = self._make_request(endpoint, params)
-                
-                if response.status_code == 200:
-                    df = self._parse_response(response.json())
-                    logger.info(f'Successfully fetched {len(df)} records')
-                    
-                    # Data quality check
-                    df = self._apply_quality_checks(df)
-                    
-                    return df
-                else:
-                    logger.warning(f'API returned status {response.status_code}')
-                    
-            except Exception as e:
-                logger.error(f'Attempt {attempt + 1} failed: {str(e)}')
-                if attempt < retry_attempts - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    raise
+        df = self._parse_response(orjson.loads(response.content))
+        logger.info(f'Successfully fetched {len(df)} records')
+        
+        # Data quality check
+        df = self._apply_quality_checks(df)
         
-        raise Exception('Failed to fetch data after all retry attempts')
+        return df
     
     def fetch_current_generation(self) -> pd.DataFrame:
         """
@@ -98,7 +230,7 @@ class ElexonDataFetcher:
         Returns:
             DataFrame with current generation mix
         """
-        end_date = datetime.utcnow()
+        end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(hours=24)
         return self.fetch_generation_data(start_date, end_date)
     
@@ -106,47 +238,333 @@ class ElexonDataFetcher:
         """
         Fetch historical generation data for specified number of days.
         
+        Thin synchronous wrapper around fetch_historical_data_async. When called
+        from inside a running event loop (e.g. Jupyter), the fetch runs on a
+        worker thread with its own loop; async callers can await
+        fetch_historical_data_async directly instead.
+        
+        Args:
+            days: Number of days of historical data to fetch
+            
+        Returns:
+            DataFrame with historical generation data
+            
+        Raises:
+            requests.RequestException: If a chunk still fails after retries
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_historical_data_async(days))
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.fetch_historical_data_async(days)).result()
+    
+    async def fetch_historical_data_async(self, days: int = 7) -> pd.DataFrame:
+        """
+        Fetch historical generation data, requesting all chunks concurrently.
+        
         Args:
             days: Number of days of historical data to fetch
             
         Returns:
             DataFrame with historical generation data
+            
+        Raises:
+            requests.RequestException: If a chunk still fails after retries
+                (httpx errors are re-raised as the matching requests type)
         """
-        end_date = datetime.utcnow()
+        end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
         
+        # Short-circuit network and parsing when a fresh Parquet copy exists
+        cached_df = self.fetch_from_cache(days)
+        if cached_df is not None:
+            return cached_df
+        
         # Fetch in chunks to be respectful to API
-        all_data = []
-        chunk_size = 7  # days per request
+        chunks = self._build_chunks(start_date, end_date)
         
-        current_start = start_date
-        while current_start < end_date:
-            current_end = min(current_start + timedelta(days=chunk_size), end_date)
-            
-            logger.info(f'Fetching chunk: {current_start.date()} to {current_end.date()}')
-            chunk_df = self.fetch_generation_data(current_start, current_end)
-            all_data.append(chunk_df)
-            
-            current_start = current_end
-            time.sleep(1)  # Rate limiting
+        # Cap the number of in-flight requests; header-driven backoff happens per chunk
+        sem = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        async def fetch_bounded(client, chunk_start, chunk_end):
+            async with sem:
+                return await self._fetch_chunk_async(client, chunk_start, chunk_end)
+        
+        # HTTP/2 multiplexes concurrent chunk requests over a single connection;
+        # the cache transport replays settled chunks from disk
+        transport = hishel.AsyncCacheTransport(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=10)
+            ),
+            storage=hishel.AsyncFileStorage(
+                base_path=HTTP_CACHE_PATH,
+                ttl=_CACHE_TTL.total_seconds()
+            )
+        )
+        
+        async with httpx.AsyncClient(
+            transport=transport,
+            timeout=30,
+            headers=dict(self.session.headers)
+        ) as client:
+            tasks = [
+                asyncio.ensure_future(fetch_bounded(client, chunk_start, chunk_end))
+                for chunk_start, chunk_end in chunks
+            ]
+            try:
+                all_data = await asyncio.gather(*tasks)
+            except BaseException:
+                # Don't leave sibling chunks running against a closing client
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
         
         combined_df = pd.concat(all_data, ignore_index=True)
+        
+        # Chunks may carry differing category sets, in which case concat falls back to object
+        if 'fuel_type' in combined_df:
+            combined_df['fuel_type'] = combined_df['fuel_type'].astype('category')
+        
         logger.info(f'Fetched {len(combined_df)} total records over {days} days')
         
+        if not combined_df.empty:
+            self.save(combined_df, self._cache_path(days).name, format='parquet')
+        
         return combined_df
     
-    def _make_request(self, endpoint: str, params: Dict) -> requests.Response:
+    def fetch_from_cache(self, days: int = 7) -> Optional[pd.DataFrame]:
+        """
+        Load the last historical fetch of the given span from Parquet.
+        
+        Args:
+            days: Number of days of historical data
+            
+        Returns:
+            Cached DataFrame, or None if no file exists or it is older than
+            DATA_REFRESH_INTERVAL
+        """
+        filepath = self._cache_path(days)
+        
+        if not filepath.exists():
+            return None
+        
+        age = time.time() - filepath.stat().st_mtime
+        if age > DATA_REFRESH_INTERVAL:
+            logger.info(f'Cache file {filepath.name} is stale ({age:.0f}s old)')
+            return None
+        
+        df = pd.read_parquet(filepath)
+        logger.info(f'Loaded {len(df)} records from cache {filepath}')
+        
+        return df
+    
+    def _cache_path(self, days: int) -> Path:
+        """
+        Parquet cache location for a historical span.
+        
+        One file per span - each fresh fetch overwrites the last, so files
+        don't accumulate.
+        """
+        return RAW_DATA_DIR / f'gen_last_{days}d.parquet'
+    
+    def _build_chunks(
+        self,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Split a date range into consecutive (start, end) request windows.
+        
+        Inner boundaries fall on a fixed CHUNK_SIZE_DAYS grid counted from the
+        Unix epoch, so the same windows (and HTTP cache keys) recur across runs.
+        """
+        chunks = []
+        step = timedelta(days=self.CHUNK_SIZE_DAYS)
+        epoch = datetime(1970, 1, 1, tzinfo=start_date.tzinfo)
+        
+        current_start = start_date
+        while current_start < end_date:
+            boundary = epoch + ((current_start - epoch) // step + 1) * step
+            current_end = min(boundary, end_date)
+            chunks.append((current_start, current_end))
+            current_start = current_end
+        
+        return chunks
+    
+    async def _fetch_chunk_async(
+        self,
+        client: httpx.AsyncClient,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """
+        Fetch and clean a single chunk of generation data.
+        
+        Args:
+            client: Open httpx client to issue the request on
+            start: Start datetime for the chunk
+            end: End datetime for the chunk
+            
+        Returns:
+            DataFrame with columns: timestamp, fuel_type, generation_mw
+        """
+        logger.info(f'Fetching chunk: {start.date()} to {end.date()}')
+        
+        endpoint, params = self._generation_request(start, end)
+        
+        # Elexon sends no cache headers, so force caching for windows it will no
+        # longer revise and bypass the cache for ones that are still live
+        if self._is_settled(end):
+            extensions = {'force_cache': True}
+        else:
+            extensions = {'cache_disabled': True}
+        
+        try:
+            response = await self._request_chunk_async(client, endpoint, params, extensions)
+        except httpx.HTTPError as e:
+            raise _as_requests_error(e) from e
+        
+        data = orjson.loads(response.content)
+        
+        df = self._parse_response(data)
+        logger.info(f'Successfully fetched {len(df)} records')
+        
+        return self._apply_quality_checks(df)
+    
+    async def _request_chunk_async(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        params: Dict,
+        extensions: Dict
+    ) -> httpx.Response:
+        """
+        GET a chunk, retrying transport errors and RETRY_STATUS_CODES with backoff.
+        """
+        # Never time.sleep in this loop - it would stall every in-flight chunk
+        for attempt in range(self.RETRY_ATTEMPTS + 1):
+            backoff = self.RETRY_BACKOFF_FACTOR * 2 ** attempt
+            can_retry = attempt < self.RETRY_ATTEMPTS
+            
+            start_time = time.time()
+            try:
+                response = await client.get(endpoint, params=params, extensions=extensions)
+            except httpx.TransportError as e:
+                if not can_retry:
+                    raise
+                logger.warning(f'Attempt {attempt + 1} failed: {e!r}, retrying chunk in {backoff:.1f}s')
+                await asyncio.sleep(backoff)
+                continue
+            
+            cached = response.extensions.get('from_cache', False)
+            self._log_request(
+                start_time,
+                response.status_code,
+                response.headers,
+                cached=cached,
+                http_version=response.http_version
+            )
+            
+            # Replayed responses carry the rate-limit headers from when they were stored
+            if cached:
+                response.raise_for_status()
+                break
+            
+            delay = _rate_limit_delay(response.headers)
+            if response.status_code in self.RETRY_STATUS_CODES and can_retry:
+                delay = delay or backoff
+                logger.warning(f'API returned status {response.status_code}, retrying chunk in {delay:.1f}s')
+                await asyncio.sleep(delay)
+                continue
+            
+            response.raise_for_status()
+            if delay:
+                logger.info(f'Approaching rate limit, pausing {delay:.1f}s')
+                await asyncio.sleep(delay)
+            break
+        
+        return response
+    
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Dict,
+        cacheable: bool = True
+    ) -> requests.Response:
         """
         Make HTTP request to API with error handling and timing.
+        
+        Pauses only when rate-limit headers ask for it. When the session is a
+        CachedSession, cacheable=False bypasses the cache for this request.
         """
+        kwargs = {}
+        if not cacheable and isinstance(self.session, CachedSession):
+            kwargs['expire_after'] = DO_NOT_CACHE
+        
         start_time = time.time()
-        response = self.session.get(endpoint, params=params, timeout=30)
-        latency = (time.time() - start_time) * 1000
+        response = self.session.get(endpoint, params=params, timeout=30, **kwargs)
+        
+        self._log_request(
+            start_time,
+            response.status_code,
+            response.headers,
+            cached=getattr(response, 'from_cache', False)
+        )
         
-        logger.info(f'API request completed in {latency:.2f}ms - Status: {response.status_code}')
+        # 429s are retried by the adapter; this handles a low remaining quota
+        if not getattr(response, 'from_cache', False):
+            delay = _rate_limit_delay(response.headers)
+            if delay:
+                logger.info(f'Approaching rate limit, pausing {delay:.1f}s')
+                time.sleep(delay)
         
         return response
     
+    def _generation_request(self, start_date: datetime, end_date: datetime) -> Tuple[str, Dict]:
+        """
+        Endpoint and query params for the per-type generation API.
+        """
+        endpoint = f'{self.BASE_URL}/generation/actual/per-type'
+        
+        params = {
+            'from': _iso(start_date),
+            'to': _iso(end_date)
+        }
+        
+        return endpoint, params
+    
+    def _log_request(
+        self,
+        start_time: float,
+        status_code: int,
+        headers: Mapping[str, str],
+        cached: bool = False,
+        http_version: Optional[str] = None
+    ) -> None:
+        """
+        Log latency, status and transfer details for a completed request.
+        """
+        latency = (time.time() - start_time) * 1000
+        version = f' - {http_version}' if http_version else ''
+        
+        logger.info(
+            f'API request completed in {latency:.2f}ms - Status: {status_code}{version} '
+            f'- Encoding: {headers.get("Content-Encoding", "identity")}'
+            f'{" (cached)" if cached else ""}'
+        )
+    
+    def _is_settled(self, end_date: datetime) -> bool:
+        """
+        Whether a window ending at end_date is old enough to serve from cache.
+        """
+        if end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - end_date >= _CACHE_TTL
+    
     def _parse_response(self, data: Dict) -> pd.DataFrame:
         """
         Parse JSON response from Elexon API into DataFrame.
@@ -157,25 +575,33 @@ class ElexonDataFetcher:
         Returns:
             Parsed DataFrame with columns: timestamp, fuel_type, generation_mw
         """
-        records = []
+        # Build column arrays directly rather than a dict per record
+        timestamps = []
+        fuel_types = []
+        generation = []
         
         for period in data.get('data', []):
             timestamp = period['startTime']
             
             for entry in period.get('data', []):
-                records.append({
-                    'timestamp': timestamp,
-                    'fuel_type': entry['psrType'],
-                    'generation_mw': entry['quantity']
-                })
+                timestamps.append(timestamp)
+                fuel_types.append(entry['psrType'])
+                generation.append(entry['quantity'])
         
-        df = pd.DataFrame(records)
+        if not timestamps:
+            return pd.DataFrame()
         
-        if not df.empty:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp').reset_index(drop=True)
+        # Small fixed set of fuel codes - store as category for cheaper groupby/memory
+        df = pd.DataFrame({
+            'timestamp': timestamps,
+            'fuel_type': pd.Categorical(fuel_types),
+            'generation_mw': np.asarray(generation, dtype=np.float32)  # MW values < 60000; float32 is ample
+        })
         
-        return df
+        # Explicit format skips per-row format inference
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, format='ISO8601')
+        
+        return df.sort_values('timestamp', ignore_index=True)
     
     def _apply_quality_checks(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -193,61 +619,95 @@ class ElexonDataFetcher:
         if df.empty:
             return df
         
-        # Calculate total generation per timestamp
-        totals = df.groupby('timestamp')['generation_mw'].sum().reset_index()
-        totals.columns = ['timestamp', 'total_generation']
+        # Sum generation per timestamp via integer codes + bincount. Like groupby,
+        # null quantities count as 0 and rows without a timestamp (code -1) are dropped
+        codes, uniques = pd.factorize(df['timestamp'], sort=False)
+        valid = codes >= 0
+        weights = np.nan_to_num(df['generation_mw'].to_numpy(dtype=np.float64)[valid])
+        totals = np.bincount(codes[valid], weights=weights, minlength=len(uniques))
         
-        # Flag suspicious periods (total < 25 GW indicates incomplete data)
-        totals['quality_flag'] = totals['total_generation'] >= self.MIN_TOTAL_GENERATION
+        # Broadcast the totals back onto each row
+        row_totals = np.full(len(df), np.nan)
+        row_totals[valid] = totals[codes[valid]]
         
-        # Merge quality flags back
-        df = df.merge(totals[['timestamp', 'total_generation', 'quality_flag']], on='timestamp')
+        # Flag suspicious periods (total < 25 GW indicates incomplete data)
+        good_periods = totals >= self.MIN_TOTAL_GENERATION
+        mask = valid.copy()
+        mask[valid] = good_periods[codes[valid]]
         
         # Log quality issues
-        bad_records = (~df['quality_flag']).sum()
+        bad_records = (valid & ~mask).sum()
         if bad_records > 0:
             logger.warning(f'Found {bad_records} records with quality issues (incomplete data)')
-            bad_periods = df['timestamp'].nunique() - df[df['quality_flag']]['timestamp'].nunique()
+            bad_periods = (~good_periods).sum()
             logger.warning(f'Filtering out {bad_periods} time periods')
         
-        # Filter to only good quality data
-        df_clean = df[df['quality_flag']].drop(columns=['quality_flag']).reset_index(drop=True)
+        # Filter to only good quality data (a new frame - the caller's df is untouched)
+        df_clean = df.iloc[mask].reset_index(drop=True)
+        df_clean['total_generation'] = row_totals[mask].astype(np.float32)
         
         return df_clean
     
-    def save_to_csv(self, df: pd.DataFrame, filename: str) -> Path:
+    def save(self, df: pd.DataFrame, filename: str, format: Optional[str] = None) -> Path:
         """
-        Save DataFrame to CSV in raw data directory.
+        Save DataFrame to the raw data directory.
+        
+        Parquet (snappy-compressed, via pyarrow) preserves dtypes and is much
+        smaller and faster to reload than CSV.
         
         Args:
             df: DataFrame to save
-            filename: Name of CSV file
+            filename: Name of output file. A .parquet or .csv suffix selects the
+                format; with no suffix, the format's suffix is added. Other
+                suffixes are kept as given.
+            format: 'parquet' or 'csv'. Defaults to the suffix's format, else
+                'parquet'.
             
         Returns:
             Path to saved file
         """
         filepath = RAW_DATA_DIR / filename
-        df.to_csv(filepath, index=False)
+        suffix_format = filepath.suffix.lower().lstrip('.')
+        
+        if suffix_format in ('parquet', 'csv'):
+            if format is not None and format != suffix_format:
+                raise ValueError(f"Filename '{filename}' does not match format '{format}'")
+            format = suffix_format
+        elif format is None:
+            format = 'parquet'
+        
+        if format not in ('parquet', 'csv'):
+            raise ValueError(f"Unsupported format '{format}' - expected 'parquet' or 'csv'")
+        
+        if not filepath.suffix:
+            filepath = filepath.with_suffix(f'.{format}')
+        
+        if format == 'parquet':
+            df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
+        else:
+            df.to_csv(filepath, index=False)
+        
         logger.info(f'Data saved to {filepath}')
         return filepath
     
-    def get_fuel_type_mapping(self) -> Dict[str, str]:
+    def save_to_csv(self, df: pd.DataFrame, filename: str) -> Path:
+        """
+        Save DataFrame to CSV in raw data directory.
+        
+        Args:
+            df: DataFrame to save
+            filename: Name of CSV file
+            
+        Returns:
+            Path to saved file
+        """
+        return self.save(df, filename, format='csv')
+    
+    def get_fuel_type_mapping(self) -> Mapping[str, str]:
         """
         Returns standardized fuel type names and categories.
         """
-        return {
-            'Biomass': 'renewable',
-            'Fossil Gas': 'fossil',
-            'Fossil Hard coal': 'fossil',
-            'Fossil Oil': 'fossil',
-            'Hydro Pumped Storage': 'renewable',
-            'Hydro Run-of-river and poundage': 'renewable',
-            'Nuclear': 'nuclear',
-            'Other': 'other',
-            'Solar': 'renewable',
-            'Wind Offshore': 'renewable',
-            'Wind Onshore': 'renewable'
-        }
+        return _FUEL_TYPE_MAPPING
 
 
 # Convenience functions